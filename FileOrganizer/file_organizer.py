@@ -3,13 +3,19 @@
 File Organizer - Automatically organize files by type into folders
 """
 
+import ctypes
+import errno
+import itertools
 import os
 import shutil
+import sys
+import tempfile
 from pathlib import Path
-from datetime import datetime
 import argparse
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 
-FILE_CATEGORIES = {
+_RAW_CATEGORIES = {
     'Images': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp', '.ico', '.tiff'],
     'Videos': ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.mpg', '.mpeg'],
     'Documents': ['.pdf', '.doc', '.docx', '.txt', '.odt', '.xls', '.xlsx', '.ppt', '.pptx'],
@@ -20,105 +26,340 @@ FILE_CATEGORIES = {
     'Data': ['.csv', '.json', '.xml', '.sql', '.db', '.sqlite']
 }
 
+# Extension sets per category; FILE_CATEGORY_ORDER keeps the display order
+FILE_CATEGORIES = {category: frozenset(exts) for category, exts in _RAW_CATEGORIES.items()}
+FILE_CATEGORY_ORDER = list(_RAW_CATEGORIES)
+
+# Flat extension -> category lookup. Some extensions (.json, .xml, .sql) are
+# listed under more than one category; the first category listed wins, so
+# the categories are walked in reverse and earlier ones overwrite later ones.
+EXT_TO_CATEGORY = {
+    ext: category
+    for category, extensions in reversed(list(_RAW_CATEGORIES.items()))
+    for ext in extensions
+}
+
+# Same lookup keyed without the leading dot, for matching name.rpartition('.')
+_BARE_EXT_TO_CATEGORY = {ext[1:]: category for ext, category in EXT_TO_CATEGORY.items()}
+
+def _categorize(name):
+    """Determine the category of a file name from the text after its last dot"""
+    head, _, ext = name.rpartition('.')
+    # An empty head means no dot at all, or a dotfile such as .bashrc
+    return _BARE_EXT_TO_CATEGORY.get(ext.lower(), 'Others') if head else 'Others'
+
+# macOS and Windows volumes are case-insensitive by default, so names that
+# differ only in case must be treated as the same file there
+if sys.platform in ('darwin', 'win32', 'cygwin'):
+    _name_key = str.casefold
+else:
+    def _name_key(name):
+        return name
+
+def _unique_name(name, taken):
+    """Return name, or name with a _1, _2, ... suffix, that is not in taken
+
+    taken holds _name_key'd names and is updated with the result.
+    """
+    new_name = name
+    if _name_key(new_name) in taken:
+        stem, suffix = os.path.splitext(name)
+        for n in itertools.count(1):
+            new_name = f"{stem}_{n}{suffix}"
+            if _name_key(new_name) not in taken:
+                break
+    taken.add(_name_key(new_name))
+    return new_name
+
+# On Linux, renameat2(RENAME_NOREPLACE) makes the kernel refuse to overwrite
+# an existing destination, so collisions are detected atomically by the move
+_AT_FDCWD = -100
+_RENAME_NOREPLACE = 1
+_renameat2 = None
+if sys.platform.startswith('linux'):
+    try:
+        _renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+        _renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+        _renameat2.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _renameat2 = None
+
+# Destination directories whose filesystem rejected RENAME_NOREPLACE
+_noreplace_unsupported = set()
+
+def _rename_noreplace(src, dst):
+    """Rename src to dst, raising FileExistsError rather than replacing dst
+
+    A cross-device rename raises OSError with errno EXDEV. Where renameat2 is
+    unavailable, or the filesystem rejects RENAME_NOREPLACE, this falls back
+    to a plain os.rename, so no-replace is NOT guaranteed there: on POSIX an
+    existing dst is replaced, and collisions are only avoided through the
+    names scanned at the start of the run. ENOSYS switches renameat2 off for
+    the process and EINVAL for dst's directory, so the fallback costs one
+    syscall per move rather than a failing renameat2 plus os.rename.
+    """
+    global _renameat2
+    renameat2 = _renameat2
+    if renameat2 is not None:
+        directory = os.path.dirname(dst)
+        if directory not in _noreplace_unsupported:
+            if renameat2(_AT_FDCWD, os.fsencode(src), _AT_FDCWD, os.fsencode(dst), _RENAME_NOREPLACE) == 0:
+                return
+            err = ctypes.get_errno()
+            if err == errno.ENOSYS:
+                _renameat2 = None
+            elif err == errno.EINVAL:
+                _noreplace_unsupported.add(directory)
+            else:
+                # OSError picks the matching subclass, e.g. FileExistsError
+                raise OSError(err, os.strerror(err), src, None, dst)
+    os.rename(src, dst)
+
+def _stage_copy(src, directory):
+    """Copy src into directory under a temporary name and return its path"""
+    fd, tmp = tempfile.mkstemp(prefix='.', suffix='.tmp', dir=directory)
+    os.close(fd)
+    try:
+        # copy2 uses the kernel's fast copy paths (sendfile, copy_file_range)
+        shutil.copy2(src, tmp)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return tmp
+
+def _move_unique(src, dst, name):
+    """Move src to dst, or to a numbered variant of name if dst was taken
+
+    Names are claimed by the rename itself, so concurrent workers (or other
+    programs) writing into the same directory never overwrite each other.
+    Across filesystems the file is copied once to a temporary name beside
+    dst, and that copy is what claims the final name.
+    """
+    directory = os.path.dirname(dst)
+    stem, suffix = os.path.splitext(name)
+    candidates = (os.path.join(directory, f"{stem}_{n}{suffix}") for n in itertools.count(1))
+    source = src
+    staged = False
+    try:
+        while True:
+            try:
+                _rename_noreplace(source, dst)
+                break
+            except FileExistsError:
+                dst = next(candidates)
+            except OSError as e:
+                if e.errno != errno.EXDEV or staged:
+                    raise
+                source = _stage_copy(src, directory)
+                staged = True
+    except BaseException:
+        if staged:
+            os.unlink(source)
+        raise
+    if staged:
+        os.unlink(src)
+
+def _existing_names(directory, create=True):
+    """Return the _name_key'd names in directory, creating it if missing"""
+    try:
+        with os.scandir(directory) as it:
+            return {_name_key(e.name) for e in it}
+    except FileNotFoundError:
+        if not create:
+            return set()
+        try:
+            os.mkdir(directory)
+        except FileExistsError:
+            # Created by someone else since the scandir; list it after all
+            return _existing_names(directory, create=False)
+        return set()
+
+def _flush_lines(lines):
+    """Write buffered output lines to stdout and clear the buffer"""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        lines.clear()
+
 class FileOrganizer:
-    def __init__(self, source_dir, destination_dir=None):
+    def __init__(self, source_dir, destination_dir=None, on_event=None, skip_others=False):
         self.source_dir = Path(source_dir)
         self.destination_dir = Path(destination_dir) if destination_dir else self.source_dir
+        self._src_str = os.fspath(self.source_dir)
+        self._dest_str = os.fspath(self.destination_dir)
+        self.on_event = on_event
+        self.skip_others = skip_others
         self.moved_files = []
         self.errors = []
 
+    def _emit(self, line):
+        """Report a line of output to on_event, or print it if none is set"""
+        if self.on_event:
+            self.on_event(line)
+        else:
+            print(line)
+
     def get_file_category(self, file_path):
-        """Determine the category of a file based on its extension"""
-        extension = file_path.suffix.lower()
-        for category, extensions in FILE_CATEGORIES.items():
-            if extension in extensions:
-                return category
-        return 'Others'
+        """Determine the category of a file (str or Path) based on its extension"""
+        return _categorize(os.path.basename(os.fspath(file_path)))
+
+    def _iter_source_entries(self):
+        """Yield DirEntry objects for regular files in the source directory"""
+        with os.scandir(self._src_str) as it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False):
+                    yield entry
+
+    def _iter_files_to_organize(self):
+        """Yield (path, name, category) for each source file to organize"""
+        for entry in self._iter_source_entries():
+            category = _categorize(entry.name)
+            if category == 'Others' and self.skip_others:
+                continue
+            yield entry.path, entry.name, category
+
+    def _plan_moves(self, dry_run=False):
+        """Yield (src, dst, name, category, error) for each file to organize
+
+        Each category directory is listed (or created, unless dry_run) the
+        first time one of its files is seen, and names taken in it are
+        tracked in memory so collisions are resolved without a stat per file.
+        If a category directory cannot be used, its files are yielded with dst
+        None and the OSError as error. Files already in their category's
+        directory (the source itself) are yielded with dst and error None.
+        """
+        source_key = _name_key(os.path.normcase(os.path.abspath(self._src_str)))
+        used = {}
+        failed = {}
+        category_dirs = {}
+        for src, name, category in self._iter_files_to_organize():
+            if category not in category_dirs:
+                category_dir = category_dirs[category] = os.path.join(self._dest_str, category)
+                if _name_key(os.path.normcase(os.path.abspath(category_dir))) == source_key:
+                    # Already organizing inside this category's directory
+                    used[category] = None
+                else:
+                    try:
+                        used[category] = _existing_names(category_dir, create=not dry_run)
+                    except OSError as e:
+                        failed[category] = e
+            if category in failed:
+                yield src, None, name, category, failed[category]
+                continue
+            if used[category] is None:
+                yield src, None, name, category, None
+                continue
+
+            # Generate unique filename if file already exists
+            new_name = _unique_name(name, used[category])
+            yield src, os.path.join(category_dirs[category], new_name), name, category, None
+
+    def _record_move(self, future, name, category, log):
+        """Record the outcome of a finished move"""
+        try:
+            future.result()
+            self.moved_files.append((name, category))
+            log(f"✓ Moved: {name} → {category}/")
+        except Exception as e:
+            self.errors.append((name, str(e)))
+            log(f"✗ Error moving {name}: {e}")
 
     def organize_files(self, dry_run=False):
         """Organize files in the source directory"""
         if not self.source_dir.exists():
-            print(f"Error: Source directory '{self.source_dir}' does not exist!")
+            self._emit(f"Error: Source directory '{self.source_dir}' does not exist!")
             return
 
-        print(f"{'[DRY RUN] ' if dry_run else ''}Organizing files in: {self.source_dir}")
-        print(f"Destination: {self.destination_dir}\n")
+        self._emit(f"{'[DRY RUN] ' if dry_run else ''}Organizing files in: {self.source_dir}")
+        self._emit(f"Destination: {self.destination_dir}\n")
 
-        files_to_organize = []
+        # Per-file messages stream to on_event when set; otherwise they are
+        # buffered and written to stdout every 1024 lines
+        log_lines = []
+        if self.on_event:
+            log = self._emit
+        else:
+            def log(line):
+                log_lines.append(line)
+                if len(log_lines) >= 1024:
+                    _flush_lines(log_lines)
 
-        # Collect all files to organize
-        for item in self.source_dir.iterdir():
-            if item.is_file():
-                category = self.get_file_category(item)
-                files_to_organize.append((item, category))
+        try:
+            found = False
+            if dry_run:
+                for _, dst, name, category, error in self._plan_moves(dry_run=True):
+                    found = True
+                    if error is not None:
+                        log(f"✗ Cannot move {name}: {error}")
+                    elif dst is None:
+                        log(f"Skipped: {name} (already in {category}/)")
+                    else:
+                        log(f"Would move: {name} → {category}/")
+            else:
+                # Moves are submitted while the directory is still being scanned,
+                # with at most a few batches in flight so memory stays bounded
+                max_workers = min(32, (os.cpu_count() or 1) * 4)
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    pending = {}
+                    try:
+                        for src, dst, name, category, error in self._plan_moves():
+                            found = True
+                            if error is not None:
+                                self.errors.append((name, str(error)))
+                                log(f"✗ Error moving {name}: {error}")
+                                continue
+                            if dst is None:
+                                log(f"Skipped: {name} (already in {category}/)")
+                                continue
+                            pending[executor.submit(_move_unique, src, dst, name)] = (name, category)
+                            if len(pending) >= max_workers * 4:
+                                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                                for future in done:
+                                    self._record_move(future, *pending.pop(future), log)
+                    finally:
+                        # Report moves already submitted even if planning failed
+                        for future in as_completed(pending):
+                            self._record_move(future, *pending[future], log)
+        finally:
+            _flush_lines(log_lines)
 
-        if not files_to_organize:
-            print("No files found to organize!")
+        if not found:
+            self._emit("No files found to organize!")
             return
 
-        # Organize files by category
-        for file_path, category in files_to_organize:
-            category_dir = self.destination_dir / category
-
-            if not dry_run:
-                # Create category directory if it doesn't exist
-                category_dir.mkdir(exist_ok=True)
-
-                # Generate unique filename if file already exists
-                destination = category_dir / file_path.name
-                if destination.exists():
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    new_name = f"{file_path.stem}_{timestamp}{file_path.suffix}"
-                    destination = category_dir / new_name
-
-                try:
-                    # Move the file
-                    shutil.move(str(file_path), str(destination))
-                    self.moved_files.append((file_path.name, category))
-                    print(f"✓ Moved: {file_path.name} → {category}/")
-                except Exception as e:
-                    self.errors.append((file_path.name, str(e)))
-                    print(f"✗ Error moving {file_path.name}: {e}")
-            else:
-                print(f"Would move: {file_path.name} → {category}/")
-
         # Print summary
         self.print_summary(dry_run)
 
     def print_summary(self, dry_run=False):
         """Print organization summary"""
-        print("\n" + "="*50)
+        self._emit("\n" + "="*50)
         if dry_run:
-            print("DRY RUN COMPLETE - No files were actually moved")
+            self._emit("DRY RUN COMPLETE - No files were actually moved")
         else:
-            print(f"ORGANIZATION COMPLETE")
-            print(f"Files moved: {len(self.moved_files)}")
+            self._emit(f"ORGANIZATION COMPLETE")
+            self._emit(f"Files moved: {len(self.moved_files)}")
             if self.errors:
-                print(f"Errors: {len(self.errors)}")
+                self._emit(f"Errors: {len(self.errors)}")
                 for file_name, error in self.errors:
-                    print(f"  - {file_name}: {error}")
+                    self._emit(f"  - {file_name}: {error}")
 
         # Show organized categories
         if self.moved_files:
-            categories = {}
-            for file_name, category in self.moved_files:
-                if category not in categories:
-                    categories[category] = 0
-                categories[category] += 1
+            categories = Counter(category for _, category in self.moved_files)
 
-            print("\nFiles by category:")
+            self._emit("\nFiles by category:")
             for category, count in sorted(categories.items()):
-                print(f"  {category}: {count} file(s)")
+                self._emit(f"  {category}: {count} file(s)")
 
 def main():
     parser = argparse.ArgumentParser(description="Organize files by type into categorized folders")
     parser.add_argument("source", nargs='?', default=".", help="Source directory to organize (default: current directory)")
     parser.add_argument("-d", "--destination", help="Destination directory (default: same as source)")
     parser.add_argument("--dry-run", action="store_true", help="Preview what would be organized without moving files")
+    parser.add_argument("--skip-others", action="store_true", help="Leave files with unrecognized extensions in place")
 
     args = parser.parse_args()
 
-    organizer = FileOrganizer(args.source, args.destination)
+    organizer = FileOrganizer(args.source, args.destination, skip_others=args.skip_others)
     organizer.organize_files(dry_run=args.dry_run)
 
 if __name__ == "__main__":
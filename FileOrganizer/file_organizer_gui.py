@@ -6,8 +6,9 @@ File Organizer GUI - Simple graphical interface for the file organizer
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import threading
+import queue
 from pathlib import Path
-from file_organizer import FileOrganizer, FILE_CATEGORIES
+from file_organizer import FileOrganizer, FILE_CATEGORIES, FILE_CATEGORY_ORDER
 
 class FileOrganizerGUI:
     def __init__(self, root):
@@ -69,8 +70,8 @@ class FileOrganizerGUI:
         categories_text.config(yscrollcommand=scrollbar.set)
 
         # Display categories
-        for category, extensions in FILE_CATEGORIES.items():
-            categories_text.insert(tk.END, f"{category}: {', '.join(extensions)}\n")
+        for category in FILE_CATEGORY_ORDER:
+            categories_text.insert(tk.END, f"{category}: {', '.join(sorted(FILE_CATEGORIES[category]))}\n")
         categories_text.config(state=tk.DISABLED)
 
         # Action Buttons
@@ -144,40 +145,78 @@ class FileOrganizerGUI:
 
         # Clear output
         self.output_text.delete(1.0, tk.END)
+        self.output_text.insert(tk.END, f"{'[DRY RUN] ' if dry_run else ''}Starting file organization...\n\n")
+
+        # The worker thread never touches Tk directly: output lines (and
+        # dialogs, as callables) go through this queue, which is drained on
+        # the main thread by poll_output. None marks the end of the run.
+        events = queue.Queue()
 
         # Run organizer in separate thread to prevent UI freezing
         def run_organizer():
             try:
-                self.output_text.insert(tk.END, f"{'[DRY RUN] ' if dry_run else ''}Starting file organization...\n\n")
-
-                organizer = FileOrganizer(source, dest)
-
-                # Redirect output to GUI
-                import sys
-                from io import StringIO
-
-                old_stdout = sys.stdout
-                sys.stdout = StringIO()
-
+                organizer = FileOrganizer(source, dest, on_event=events.put_nowait)
                 organizer.organize_files(dry_run=dry_run)
 
-                output = sys.stdout.getvalue()
-                sys.stdout = old_stdout
-
-                self.output_text.insert(tk.END, output)
-                self.output_text.see(tk.END)
-
                 if not dry_run and organizer.moved_files:
-                    messagebox.showinfo("Success", f"Successfully organized {len(organizer.moved_files)} files!")
+                    count = len(organizer.moved_files)
+                    events.put_nowait(lambda: messagebox.showinfo("Success", f"Successfully organized {count} files!"))
 
             except Exception as e:
-                messagebox.showerror("Error", f"An error occurred: {str(e)}")
-                self.output_text.insert(tk.END, f"\nError: {str(e)}")
+                error = str(e)
+                events.put_nowait(lambda: messagebox.showerror("Error", f"An error occurred: {error}"))
+                events.put_nowait(f"\nError: {error}")
+            finally:
+                events.put_nowait(None)
 
         thread = threading.Thread(target=run_organizer)
         thread.daemon = True
         thread.start()
 
+        self.root.after(50, self.poll_output, events)
+
+    def poll_output(self, events, max_lines=500):
+        """Move queued organizer output into the output widget
+
+        At most max_lines events are taken per tick and lines are inserted
+        with a single call, so a large run never holds up the Tk event loop.
+        """
+        # Follow new output only if the view was already at the bottom, so
+        # the user can scroll back through the log while a run is going
+        at_bottom = self.output_text.yview()[1] >= 1.0
+        lines = []
+        drained = 0
+        inserted = False
+        finished = False
+        while drained < max_lines:
+            try:
+                event = events.get_nowait()
+            except queue.Empty:
+                break
+            drained += 1
+            if event is None:
+                finished = True
+                break
+            if callable(event):
+                if lines:
+                    self.output_text.insert(tk.END, "\n".join(lines) + "\n")
+                    inserted = True
+                    lines = []
+                event()
+            else:
+                lines.append(event)
+
+        if lines:
+            self.output_text.insert(tk.END, "\n".join(lines) + "\n")
+            inserted = True
+        if inserted and at_bottom:
+            self.output_text.see(tk.END)
+
+        if not finished:
+            # Come back straight away if there is a backlog to work through
+            delay = 1 if drained >= max_lines else 50
+            self.root.after(delay, self.poll_output, events)
+
 def main():
     root = tk.Tk()
     app = FileOrganizerGUI(root)
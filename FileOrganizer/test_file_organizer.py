@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Regression checks for the no-replace move helpers in file_organizer
+"""
+
+import ctypes
+import errno
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import file_organizer
+
+
+def write(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+class MoveUniqueTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src_dir = os.path.join(self.tmp.name, 'src')
+        self.dst_dir = os.path.join(self.tmp.name, 'dst')
+        os.mkdir(self.src_dir)
+        os.mkdir(self.dst_dir)
+        self.src = os.path.join(self.src_dir, 'a.txt')
+        self.dst = os.path.join(self.dst_dir, 'a.txt')
+        write(self.src, 'NEW')
+        write(self.dst, 'EXISTING')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_existing_destination_gets_numbered_name(self):
+        file_organizer._move_unique(self.src, self.dst, 'a.txt')
+
+        self.assertEqual(read(self.dst), 'EXISTING')
+        self.assertEqual(read(os.path.join(self.dst_dir, 'a_1.txt')), 'NEW')
+        self.assertFalse(os.path.exists(self.src))
+
+    def test_cross_device_move_does_not_replace_existing(self):
+        rename = file_organizer._rename_noreplace
+
+        def cross_device(src, dst):
+            # Renames straight from the source fail as if on another device
+            if src == self.src:
+                raise OSError(errno.EXDEV, os.strerror(errno.EXDEV), src, None, dst)
+            return rename(src, dst)
+
+        with mock.patch.object(file_organizer, '_rename_noreplace', cross_device):
+            file_organizer._move_unique(self.src, self.dst, 'a.txt')
+
+        self.assertEqual(read(self.dst), 'EXISTING')
+        self.assertEqual(read(os.path.join(self.dst_dir, 'a_1.txt')), 'NEW')
+        self.assertFalse(os.path.exists(self.src))
+        self.assertEqual(sorted(os.listdir(self.dst_dir)), ['a.txt', 'a_1.txt'])
+
+
+class RenameFallbackTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.calls = 0
+        patches = [
+            mock.patch.object(file_organizer, '_renameat2', None),
+            mock.patch.object(file_organizer, '_noreplace_unsupported', set()),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def failing_renameat2(self, err):
+        def renameat2(*args):
+            self.calls += 1
+            ctypes.set_errno(err)
+            return -1
+        return renameat2
+
+    def move_new_file(self, directory, name):
+        os.makedirs(directory, exist_ok=True)
+        src = os.path.join(self.tmp.name, name)
+        write(src, name)
+        file_organizer._rename_noreplace(src, os.path.join(directory, name))
+
+    def test_enosys_disables_renameat2(self):
+        file_organizer._renameat2 = self.failing_renameat2(errno.ENOSYS)
+
+        self.move_new_file(os.path.join(self.tmp.name, 'd'), 'a')
+        self.move_new_file(os.path.join(self.tmp.name, 'd'), 'b')
+
+        self.assertEqual(self.calls, 1)
+        self.assertIsNone(file_organizer._renameat2)
+
+    def test_einval_is_remembered_per_directory(self):
+        file_organizer._renameat2 = self.failing_renameat2(errno.EINVAL)
+
+        self.move_new_file(os.path.join(self.tmp.name, 'd1'), 'a')
+        self.move_new_file(os.path.join(self.tmp.name, 'd1'), 'b')
+        self.move_new_file(os.path.join(self.tmp.name, 'd2'), 'c')
+
+        self.assertEqual(self.calls, 2)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, 'd1', 'b')))
+
+
+if __name__ == "__main__":
+    unittest.main()